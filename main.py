@@ -1,18 +1,23 @@
 import os
-import json
+import re
+import sys
+import time
+import bisect
 import random
+import hashlib
 import asyncio
 import aiohttp
 import discord
-from datetime import datetime
+from datetime import datetime, timedelta
 from discord.ext import commands, tasks
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional, Tuple, Union, Any
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Any, Callable, Awaitable
+from collections import OrderedDict, defaultdict
+from itertools import islice
+from dataclasses import dataclass, field
 import logging
-import aiofiles
-from dataclasses import asdict
+import orjson
+from pathlib import Path
 
 # --- Setup Logging ---
 logging.basicConfig(
@@ -40,12 +45,81 @@ class Config:
     MAX_PROBLEMS_PER_CATEGORY: int = 350
     MAX_AI_RESPONSE_LENGTH: int = 1900
     MAX_QUESTION_LENGTH: int = 500
+    SHORT_ANSWER_LENGTH: int = 1800
     SCRAPE_RETRIES: int = 3
     SCRAPE_TIMEOUT: int = 15
     AI_MODEL: str = "deepseek/deepseek-r1:free"
+    AI_CACHE_SIZE: int = 1024
+    AI_CACHE_TTL: int = 3600  # 1 hour
+    STREAM_EDIT_INTERVAL: float = 1.2  # Discord allows 5 edits per 5 seconds
+
+# Embed colors shared across commands
+_COLOR_RED = discord.Color.red()
+_COLOR_ORANGE = discord.Color.orange()
+_COLOR_GREEN = discord.Color.green()
+_COLOR_BRAND = discord.Color(0x5865F2)  # Discord blurple
+
+# Word tokenizer shared by the search index and search queries
+_TOKEN_RE = re.compile(r"\w+")
+
+# Splits AI responses into default-sized Discord chunks
+_CHUNK_RE = re.compile(rf".{{1,{Config.MAX_AI_RESPONSE_LENGTH}}}", re.S)
+
+# Lowercased titles of common interview problems
+INTERVIEW_TITLES: frozenset[str] = frozenset({
+    'two sum', 'add two numbers', 'longest substring without repeating characters',
+    'median of two sorted arrays', 'container with most water', '3sum',
+    'valid parentheses', 'merge two sorted lists', 'merge k sorted lists',
+    'search in rotated sorted array', 'combination sum', 'rotate image',
+    'group anagrams', 'maximum subarray', 'spiral matrix', 'jump game',
+    'merge intervals', 'unique paths', 'climbing stairs', 'word break',
+    'product of array except self', 'maximum product subarray'
+})
+
+# System prompt sent with every OpenRouter request
+_SYSTEM_PROMPT = (
+    "You are an advanced AI coding assistant specialized in LeetCode problems, technical interview preparation, "
+    "software development best practices, and long-term career growth for developers.\n\n"
+
+    "Your user is **Santunu Kaysar**, a passionate and forward-thinking Computer Science student with a solid foundation in "
+    "back-end development, data structures, and algorithmic problem-solving. He is the founding engineer at ServerCodeSocity, "
+    "deeply involved in writing scalable, clean, and maintainable code.\n\n"
+
+    "Santunu is an active competitive programmer on platforms like [LeetCode](https://leetcode.com/u/shantanumahin/) and "
+    "[Codeforces](https://codeforces.com/profile/shantanumahin1), where he consistently challenges himself to improve speed, logic, and efficiency.\n\n"
+
+    "His open-source contributions and projects are available on GitHub: [github.com/SantunuMahin](https://github.com/SantunuMahin/SantunuMahin). "
+    "These include applications built with Python, Django, REST APIs, automation tools, and intelligent Discord bots. "
+    "He actively strives for clean architecture, practical problem-solving, and impactful systems.\n\n"
+
+    "Santunu is also inspired by personal development books like *The 7 Habits of Highly Effective People*, *Atomic Habits*, and *The Alchemist*, "
+    "which inform his disciplined mindset and values-based leadership. He dreams of becoming a Machine Learning Engineer and using technology to address pressing global challenges, "
+    "including climate change, air pollution, and social inequality.\n\n"
+
+    "You can learn more about his professional profile here: [LinkedIn - Santunu Kaysar Mahin](https://www.linkedin.com/in/santunu-kaysar-mahin).\n\n"
+
+    "Please provide thoughtful, respectful, and technically accurate responses. Tailor your answers to help Santunu grow as a back-end developer, competitive programmer, and future ML engineer. "
+    "Use clean formatting, highlight key concepts clearly, and provide code blocks where needed. Focus on clarity, relevance, and long-term learning."
+)
+_SYSTEM_MESSAGE = {"role": "system", "content": _SYSTEM_PROMPT}
+
+# Per-command prompt templates, filled in with str.format
+_EXPLAIN_PROMPT = (
+    "Explain the programming concept '{concept}' in detail with:\n"
+    "1. Clear definition\n2. Common use cases\n3. Example code snippets\n"
+    "4. Time/space complexity\n5. Related concepts\n\n"
+    "Format with Markdown headings and code blocks."
+)
+_HINT_PROMPT = (
+    "Provide a helpful but not complete hint for LeetCode problem '{title}'. "
+    "Focus on the key insight needed to solve it."
+)
+
+# Receives the accumulated answer text while a completion streams in
+ProgressCallback = Callable[[str], Awaitable[None]]
 
 # --- Data Models ---
-@dataclass
+@dataclass(slots=True)
 class LeetCodeProblem:
     title: str
     url: str
@@ -54,6 +128,36 @@ class LeetCodeProblem:
     description: Optional[str] = None
     solution_hint: Optional[str] = None
     premium: Optional[bool] = False
+    # Derived display/search forms (casefolded for search), computed once instead of per command
+    title_cf: str = field(init=False, repr=False, compare=False)
+    topics_cf: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    difficulty_title: str = field(init=False, repr=False, compare=False)
+    is_premium: bool = field(init=False, repr=False, compare=False)
+    short_description: str = field(init=False, repr=False, compare=False)
+    # Display-only attributes the scraper doesn't fetch yet
+    acceptance_rate: str = field(default='N/A', init=False, repr=False, compare=False)
+    frequency: str = field(default='N/A', init=False, repr=False, compare=False)
+    preview_image: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.topics = self.topics or []
+        self.title_cf = self.title.casefold()
+        self.topics_cf = tuple(t.casefold() for t in self.topics)
+        self.difficulty_title = self.difficulty.capitalize()
+        self.is_premium = bool(self.premium)
+        self.short_description = self.description or 'No description available'
+
+    def to_cache_dict(self) -> dict:
+        """Serialize the persisted fields, leaving out derived ones"""
+        return {
+            'title': self.title,
+            'url': self.url,
+            'difficulty': self.difficulty,
+            'topics': self.topics,
+            'description': self.description,
+            'solution_hint': self.solution_hint,
+            'premium': self.premium
+        }
 
 @dataclass
 class BotStats:
@@ -63,13 +167,42 @@ class BotStats:
     errors_encountered: int = 0
 
 # --- Utility Classes ---
+class TTLCache:
+    """Small in-memory LRU cache whose entries expire after a fixed TTL"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Any, Tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Any, value: Any) -> None:
+        """Store a value, evicting the least recently used entry when full"""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
 class ProblemCacheManager:
     """Handles caching of LeetCode problems with TTL and validation"""
     _lock = asyncio.Lock()
+    _inflight: Optional[asyncio.Task] = None
     
     @staticmethod
-    async def load_problems() -> Dict[str, List[LeetCodeProblem]]:
+    async def load_problems(session: aiohttp.ClientSession) -> Dict[str, List[LeetCodeProblem]]:
         """Load problems from cache or fallback to defaults with TTL check"""
+        # The lock only guards cache file access, never the network fetch
         async with ProblemCacheManager._lock:
             try:
                 if await ProblemCacheManager._is_cache_valid():
@@ -79,47 +212,74 @@ class ProblemCacheManager:
                         return cached
             except Exception as e:
                 logger.error(f"Cache loading error: {e}")
-            
-            logger.info("Fetching fresh problems from LeetCode")
-            try:
-                problems = await ProblemScraper.scrape_leetcode() or ProblemDefaults.get_default_problems()
-                await ProblemCacheManager._update_cache(problems)
-                return problems
-            except Exception as e:
-                logger.error(f"Failed to fetch problems: {e}")
-                return ProblemDefaults.get_default_problems()
+        
+        # Concurrent callers join a single in-flight fetch instead of each scraping
+        task = ProblemCacheManager._inflight
+        if task is None:
+            task = asyncio.create_task(ProblemCacheManager._fetch_problems(session))
+            ProblemCacheManager._inflight = task
+            task.add_done_callback(ProblemCacheManager._clear_inflight)
+        return await asyncio.shield(task)
+
+    @staticmethod
+    async def _fetch_problems(session: aiohttp.ClientSession) -> Dict[str, List[LeetCodeProblem]]:
+        """Scrape fresh problems and write them back to the cache"""
+        logger.info("Fetching fresh problems from LeetCode")
+        try:
+            problems = await ProblemScraper.scrape_leetcode(session) or ProblemDefaults.get_default_problems()
+            await ProblemCacheManager._update_cache(problems)
+            return problems
+        except Exception as e:
+            logger.error(f"Failed to fetch problems: {e}")
+            return ProblemDefaults.get_default_problems()
+
+    @staticmethod
+    def _clear_inflight(task: asyncio.Task) -> None:
+        """Forget a finished fetch so the next cache miss starts a new one"""
+        if ProblemCacheManager._inflight is task:
+            ProblemCacheManager._inflight = None
 
     @staticmethod
     async def _is_cache_valid() -> bool:
         """Check if cache exists and is fresh"""
         try:
-            if not os.path.exists(Config.CACHE_FILE):
-                return False
-                
-            mod_time = os.path.getmtime(Config.CACHE_FILE)
-            return (datetime.now().timestamp() - mod_time) < Config.PROBLEM_CACHE_TTL
+            mod_time = os.stat(Config.CACHE_FILE).st_mtime
         except OSError:
             return False
+        return (time.time() - mod_time) < Config.PROBLEM_CACHE_TTL
 
     @staticmethod
     async def _load_cache() -> Optional[Dict[str, List[LeetCodeProblem]]]:
         """Load and validate cache"""
         try:
-            async with aiofiles.open(Config.CACHE_FILE, 'r') as f:
-                data = json.loads(await f.read())
-                if not isinstance(data, dict):
-                    return None
-                    
-                validated = {}
-                for difficulty, problems in data.items():
-                    if difficulty not in ['easy', 'medium', 'hard']:
-                        continue
-                    validated[difficulty] = [
-                        LeetCodeProblem(**p) for p in problems 
-                        if isinstance(p, dict) and ProblemCacheManager._validate_problem(p)
-                    ]
-                return validated
-        except (json.JSONDecodeError, OSError) as e:
+            raw = await asyncio.to_thread(Path(Config.CACHE_FILE).read_bytes)
+            data = orjson.loads(raw)
+            if not isinstance(data, dict):
+                return None
+                
+            validated = {}
+            # Local aliases keep the per-problem loop free of global lookups
+            ctor = LeetCodeProblem
+            intern = sys.intern
+            is_valid = ProblemCacheManager._validate_problem
+            for difficulty, problems in data.items():
+                if difficulty not in ['easy', 'medium', 'hard']:
+                    continue
+                validated[difficulty] = [
+                    ctor(
+                        p['title'],
+                        p['url'],
+                        intern(p['difficulty']),
+                        [intern(t) for t in p.get('topics') or ()],
+                        p.get('description'),
+                        p.get('solution_hint'),
+                        p.get('premium', False)
+                    )
+                    for p in problems
+                    if isinstance(p, dict) and is_valid(p)
+                ]
+            return validated
+        except (orjson.JSONDecodeError, OSError) as e:
             logger.warning(f"Cache load failed: {e}")
             return None
 
@@ -135,25 +295,43 @@ class ProblemCacheManager:
     async def _update_cache(problems: Dict[str, List[LeetCodeProblem]]) -> None:
         """Update cache atomically with error handling"""
         try:
-            temp_file = f"{Config.CACHE_FILE}.tmp"
-            async with aiofiles.open(temp_file, 'w') as f:
-                await f.write(json.dumps(
-                    {k: [asdict(p) for p in v] for k, v in problems.items()},
-                    indent=2
-                ))
-            os.replace(temp_file, Config.CACHE_FILE)
+            async with ProblemCacheManager._lock:
+                await asyncio.to_thread(ProblemCacheManager._sync_write_cache, Config.CACHE_FILE, problems)
             logger.info("Cache updated successfully")
         except Exception as e:
             logger.error(f"Failed to update cache: {e}")
+
+    @staticmethod
+    def _sync_write_cache(path: str, problems: Dict[str, List[LeetCodeProblem]]) -> None:
+        """Serialize, write, fsync and atomically swap in the cache file (runs in a worker thread)"""
+        payload = orjson.dumps(
+            {k: [p.to_cache_dict() for p in v] for k, v in problems.items()},
+            option=orjson.OPT_INDENT_2
+        )
+        temp_file = f"{path}.tmp"
+        fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            try:
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(fd, view):]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            os.replace(temp_file, path)
+        except OSError:
             try:
                 os.remove(temp_file)
             except OSError:
                 pass
+            raise
 
 class ProblemScraper:
     """Handles scraping LeetCode problems using GraphQL API"""
     
     GRAPHQL_URL = "https://leetcode.com/graphql"
+    # Bounds concurrent scrapes (startup, periodic refresh, retries) against LeetCode
+    _scrape_sem = asyncio.Semaphore(4)
     PROBLEMS_QUERY = """
     query problemsetQuestionList($categorySlug: String, $limit: Int, $filters: QuestionListFilterInput) {
         problemsetQuestionList: questionList(
@@ -175,89 +353,96 @@ class ProblemScraper:
     """
     
     @staticmethod
-    async def scrape_leetcode() -> Optional[Dict[str, List[LeetCodeProblem]]]:
-        """Scrape LeetCode problems using GraphQL API"""
-        try:
-            async with aiohttp.ClientSession() as session:
-                data = {
-                    "operationName": "problemsetQuestionList",
-                    "query": ProblemScraper.PROBLEMS_QUERY,
-                    "variables": {
-                        "categorySlug": "",
-                        "limit": 3000,
-                        "filters": {}
-                    }
-                }
-                
-                headers = {
-                    "Content-Type": "application/json",
-                    "Referer": "https://leetcode.com/problemset/all/",
-                }
+    async def scrape_leetcode(session: aiohttp.ClientSession) -> Optional[Dict[str, List[LeetCodeProblem]]]:
+        """Scrape LeetCode problems using GraphQL API, retrying transient failures with backoff"""
+        data = {
+            "operationName": "problemsetQuestionList",
+            "query": ProblemScraper.PROBLEMS_QUERY,
+            "variables": {
+                "categorySlug": "",
+                "limit": 3000,
+                "filters": {}
+            }
+        }
+        
+        headers = {
+            "Content-Type": "application/json",
+            "Accept-Encoding": "gzip, deflate",
+            "Referer": "https://leetcode.com/problemset/all/",
+        }
+        
+        async with ProblemScraper._scrape_sem:
+            for attempt in range(Config.SCRAPE_RETRIES):
+                try:
+                    async with session.post(
+                        ProblemScraper.GRAPHQL_URL,
+                        json=data,
+                        headers=headers,
+                        timeout=aiohttp.ClientTimeout(total=Config.SCRAPE_TIMEOUT)
+                    ) as response:
+                        if response.status == 200:
+                            # Parse the raw body with orjson instead of aiohttp's text decode + stdlib json
+                            result = orjson.loads(await response.read())
+                            return ProblemScraper._parse_questions(result)
+                        if response.status != 429 and response.status < 500:
+                            logger.error(f"API request failed with status {response.status}")
+                            return None
+                        logger.warning(
+                            f"Scrape attempt {attempt + 1}/{Config.SCRAPE_RETRIES} got status {response.status}"
+                        )
+                except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                    logger.warning(
+                        f"Scrape attempt {attempt + 1}/{Config.SCRAPE_RETRIES} failed: {e!r}"
+                    )
+                except Exception as e:
+                    logger.error(f"Scraping failed: {e}")
+                    return None
                 
-                async with session.post(
-                    ProblemScraper.GRAPHQL_URL,
-                    json=data,
-                    headers=headers,
-                    timeout=Config.SCRAPE_TIMEOUT
-                ) as response:
-                    if response.status != 200:
-                        logger.error(f"API request failed with status {response.status}")
-                        return None
-                        
-                    result = await response.json()
-                    questions = result.get('data', {}).get('problemsetQuestionList', {}).get('questions', [])
-                    
-                    problems = []
-                    for q in questions:
-                        try:
-                            problems.append(LeetCodeProblem(
-                                title=q['title'],
-                                url=f"https://leetcode.com/problems/{q['titleSlug']}/",
-                                difficulty=q['difficulty'].lower(),
-                                topics=[t['name'] for t in q.get('topicTags', [])],
-                                premium=q['isPaidOnly']
-                            ))
-                        except KeyError as e:
-                            logger.debug(f"Skipping invalid problem: {e}")
-                            continue
-                    
-                    return ProblemScraper._organize_by_difficulty(problems)
-        except Exception as e:
-            logger.error(f"Scraping failed: {e}")
-            return None
+                if attempt + 1 < Config.SCRAPE_RETRIES:
+                    await asyncio.sleep(2 ** attempt + random.random())
+        
+        logger.error(f"Scraping failed after {Config.SCRAPE_RETRIES} attempts")
+        return None
 
     @staticmethod
-    def _organize_by_difficulty(problems: List[LeetCodeProblem]) -> Dict[str, List[LeetCodeProblem]]:
-        """Organize problems by difficulty"""
-        organized = {'easy': [], 'medium': [], 'hard': []}
-        for problem in problems:
-            if problem.difficulty in organized:
-                organized[problem.difficulty].append(problem)
-        return organized
+    def _parse_questions(result: dict) -> Dict[str, List[LeetCodeProblem]]:
+        """Convert a GraphQL question list into problems organized by difficulty"""
+        questions = result.get('data', {}).get('problemsetQuestionList', {}).get('questions', [])
+        
+        problems: List[Optional[LeetCodeProblem]] = [None] * len(questions)
+        count = 0
+        for q in questions:
+            try:
+                problems[count] = LeetCodeProblem(
+                    title=q['title'],
+                    url=f"https://leetcode.com/problems/{q['titleSlug']}/",
+                    difficulty=q['difficulty'].lower(),
+                    topics=[t['name'] for t in q.get('topicTags', [])],
+                    premium=q['isPaidOnly']
+                )
+                count += 1
+            except KeyError as e:
+                logger.debug(f"Skipping invalid problem: {e}")
+                continue
+        del problems[count:]
+        
+        return ProblemScraper._organize_by_difficulty(problems)
 
     @staticmethod
     def _organize_by_difficulty(problems: List[LeetCodeProblem]) -> Dict[str, List[LeetCodeProblem]]:
         """Organize problems by difficulty with interview-specific handling"""
         organized = {'easy': [], 'medium': [], 'hard': [], 'interview': []}
-        
-        INTERVIEW_PROBLEMS = [
-            'two sum', 'add two numbers', 'longest substring without repeating characters',
-            'median of two sorted arrays', 'container with most water', '3sum',
-            'valid parentheses', 'merge two sorted lists', 'merge k sorted lists',
-            'search in rotated sorted array', 'combination sum', 'rotate image',
-            'group anagrams', 'maximum subarray', 'spiral matrix', 'jump game',
-            'merge intervals', 'unique paths', 'climbing stairs', 'word break',
-            'product of array except self', 'maximum product subarray'
-        ]
+        interview = organized['interview']
         
         for problem in problems:
             # Add to regular difficulty categories
-            if problem.difficulty in organized:
-                organized[problem.difficulty].append(problem)
+            bucket = organized.get(problem.difficulty)
+            if bucket is not None:
+                bucket.append(problem)
             
             # Add to interview category if it's a common interview problem
-            if problem.title.lower() in INTERVIEW_PROBLEMS:
-                organized['interview'].append(problem)
+            if problem.title.lower() in INTERVIEW_TITLES:
+                interview.append(problem)
         
         return organized
 
@@ -316,17 +501,32 @@ class ProblemDefaults:
 class AIHelper:
     """Handles AI querying with response length limiting and error handling"""
     
+    _response_cache = TTLCache(maxsize=Config.AI_CACHE_SIZE, ttl=Config.AI_CACHE_TTL)
+    _inflight: Dict[bytes, asyncio.Task] = {}
+    
+    @staticmethod
+    def _cache_key(question: str) -> bytes:
+        """Hash the model and normalized question into a compact cache key"""
+        normalized = f"{Config.AI_MODEL}:{question.strip().lower()}"
+        return hashlib.blake2b(normalized.encode(), digest_size=16).digest()
+    
     @staticmethod
-    async def query_ai(question: str) -> Optional[str]:
+    async def query_ai(
+        session: aiohttp.ClientSession,
+        question: str,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Optional[str]:
         """
         Query AI services with proper fallback and length limiting
         Args:
+            session: Shared HTTP session owned by the bot
             question: The user's question/query
+            on_progress: Optional callback fed the partial answer while streaming
         Returns:
             str: AI response or error message
         """
         try:
-            response = await AIHelper._query_openrouter(question)
+            response = await AIHelper._query_openrouter(session, question, on_progress)
             if response:
                 # Clean and truncate response
                 response = response.strip()
@@ -339,77 +539,98 @@ class AIHelper:
         return "Sorry, I couldn't process your question right now."
 
     @staticmethod
-    async def _query_openrouter(question: str) -> Optional[str]:
+    async def _query_openrouter(
+        session: aiohttp.ClientSession,
+        question: str,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Optional[str]:
         """
         Query OpenRouter API with improved response handling
         Args:
+            session: Shared HTTP session owned by the bot
             question: The user's question
+            on_progress: Optional callback fed the partial answer while streaming
         Returns:
             str: API response content or error message
         """
         if not Config.OPENROUTER_API_KEY:
             logger.error("OpenRouter API key not configured")
             return "Error: API key not configured"
-            
+        
+        cache_key = AIHelper._cache_key(question)
+        cached = AIHelper._response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Coalesce identical in-flight questions onto a single request
+        task = AIHelper._inflight.get(cache_key)
+        if task is None:
+            task = asyncio.create_task(
+                AIHelper._request_completion(session, question, cache_key, on_progress)
+            )
+            AIHelper._inflight[cache_key] = task
+            task.add_done_callback(lambda _: AIHelper._inflight.pop(cache_key, None))
+        # Shielded so one caller being cancelled doesn't abort the shared request
+        return await asyncio.shield(task)
+
+    @staticmethod
+    async def _request_completion(
+        session: aiohttp.ClientSession,
+        question: str,
+        cache_key: bytes,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> Optional[str]:
+        """
+        Send a single streaming chat completion request to OpenRouter
+        Args:
+            session: Shared HTTP session owned by the bot
+            question: The user's question
+            cache_key: Response cache key for the question
+            on_progress: Optional callback fed the partial answer while streaming
+        Returns:
+            str: API response content or error message
+        """
         headers = {
             "Authorization": f"Bearer {Config.OPENROUTER_API_KEY}",
             "Content-Type": "application/json",
+            "Accept-Encoding": "gzip, deflate",
             "HTTP-Referer": "https://github.com/SantunuMahin"
         }
         
         payload = {
             "model": Config.AI_MODEL,
             "messages": [
-                {
-                    "role": "system",
-                    "content": (
-                        "You are an advanced AI coding assistant specialized in LeetCode problems, technical interview preparation, "
-                        "software development best practices, and long-term career growth for developers.\n\n"
-
-                        "Your user is **Santunu Kaysar**, a passionate and forward-thinking Computer Science student with a solid foundation in "
-                        "back-end development, data structures, and algorithmic problem-solving. He is the founding engineer at ServerCodeSocity, "
-                        "deeply involved in writing scalable, clean, and maintainable code.\n\n"
-
-                        "Santunu is an active competitive programmer on platforms like [LeetCode](https://leetcode.com/u/shantanumahin/) and "
-                        "[Codeforces](https://codeforces.com/profile/shantanumahin1), where he consistently challenges himself to improve speed, logic, and efficiency.\n\n"
-
-                        "His open-source contributions and projects are available on GitHub: [github.com/SantunuMahin](https://github.com/SantunuMahin/SantunuMahin). "
-                        "These include applications built with Python, Django, REST APIs, automation tools, and intelligent Discord bots. "
-                        "He actively strives for clean architecture, practical problem-solving, and impactful systems.\n\n"
-
-                        "Santunu is also inspired by personal development books like *The 7 Habits of Highly Effective People*, *Atomic Habits*, and *The Alchemist*, "
-                        "which inform his disciplined mindset and values-based leadership. He dreams of becoming a Machine Learning Engineer and using technology to address pressing global challenges, "
-                        "including climate change, air pollution, and social inequality.\n\n"
-
-                        "You can learn more about his professional profile here: [LinkedIn - Santunu Kaysar Mahin](https://www.linkedin.com/in/santunu-kaysar-mahin).\n\n"
-
-                        "Please provide thoughtful, respectful, and technically accurate responses. Tailor your answers to help Santunu grow as a back-end developer, competitive programmer, and future ML engineer. "
-                        "Use clean formatting, highlight key concepts clearly, and provide code blocks where needed. Focus on clarity, relevance, and long-term learning."
-                    )
-                },
+                _SYSTEM_MESSAGE,
                 {"role": "user", "content": question}
             ],
             "temperature": 0.7,
             "max_tokens": 3000,
-            "stream": False
+            "stream": True
         }
 
 
         try:
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=Config.REQUEST_TIMEOUT)
-            ) as session:
-                async with session.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers=headers,
-                    json=payload
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data['choices'][0]['message']['content']
+            async with session.post(
+                "https://openrouter.ai/api/v1/chat/completions",
+                headers=headers,
+                data=orjson.dumps(payload)
+            ) as response:
+                if response.status != 200:
                     error_msg = f"API Error: {response.status}"
                     logger.error(error_msg)
                     return error_msg
+                
+                if response.content_type == "text/event-stream":
+                    content = await AIHelper._read_stream(response, on_progress)
+                else:
+                    # Provider ignored `stream`; fall back to the buffered body
+                    data = orjson.loads(await response.read())
+                    content = data['choices'][0]['message']['content']
+                
+                # Only successful completions are cached, never error strings
+                if content:
+                    AIHelper._response_cache.set(cache_key, content)
+                return content
         except asyncio.TimeoutError:
             error_msg = "Request timed out"
             logger.error(error_msg)
@@ -419,6 +640,61 @@ class AIHelper:
             logger.error(error_msg)
             return error_msg
 
+    @staticmethod
+    async def _read_stream(
+        response: aiohttp.ClientResponse,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> str:
+        """
+        Accumulate an OpenRouter SSE stream, reporting progress at a throttled rate
+        Args:
+            response: Open streaming response
+            on_progress: Optional callback fed the partial answer
+        Returns:
+            str: Full completion text
+        Raises:
+            RuntimeError: If the provider reports an error mid-stream
+        """
+        parts: List[str] = []
+        pending = False
+        last_emit = time.monotonic()
+        
+        async for line in response.content:
+            # SSE frames look like `data: {...}`; `:`-prefixed lines are keep-alive comments
+            if not line.startswith(b"data:"):
+                continue
+            data = line[5:].strip()
+            if data == b"[DONE]":
+                break
+            
+            chunk = orjson.loads(data)
+            if 'error' in chunk:
+                raise RuntimeError(chunk['error'].get('message', 'stream error'))
+            choices = chunk.get('choices')
+            delta = choices[0].get('delta', {}).get('content') if choices else None
+            if not delta:
+                continue
+            parts.append(delta)
+            pending = True
+            
+            if on_progress and time.monotonic() - last_emit >= Config.STREAM_EDIT_INTERVAL:
+                await AIHelper._emit_progress(on_progress, "".join(parts))
+                last_emit = time.monotonic()
+                pending = False
+        
+        content = "".join(parts)
+        if on_progress and pending:
+            await AIHelper._emit_progress(on_progress, content)
+        return content
+
+    @staticmethod
+    async def _emit_progress(on_progress: ProgressCallback, text: str) -> None:
+        """Forward partial text without letting a failed update abort the stream"""
+        try:
+            await on_progress(text)
+        except Exception as e:
+            logger.debug(f"Progress update failed: {e}")
+
     @staticmethod
     def chunk_response(text: str, max_len: int = None) -> List[str]:
         """
@@ -430,6 +706,10 @@ class AIHelper:
             List[str]: List of text chunks
         """
         max_len = max_len or Config.MAX_AI_RESPONSE_LENGTH
+        if len(text) <= max_len:
+            return [text] if text else []
+        if max_len == Config.MAX_AI_RESPONSE_LENGTH:
+            return _CHUNK_RE.findall(text)
         return [text[i:i+max_len] for i in range(0, len(text), max_len)]
 
 # --- Discord Bot Setup ---
@@ -450,30 +730,158 @@ class LeetCodeBot(commands.Bot):
                 name="for !help"
             )
         )
-        self.problems: Dict[str, List[LeetCodeProblem]] = {}
-        self.start_time = datetime.now()
+        self.problems: Dict[str, Tuple[LeetCodeProblem, ...]] = {}
+        self._problem_counts: Dict[str, int] = {}
+        self._all_problems: List[LeetCodeProblem] = []
+        self._search_index: Dict[str, set] = {}
+        self._title_keys: List[Tuple[str, int]] = []
+        self._search_text: List[str] = []
+        self._rng = random.Random()
+        # Monotonic seconds; only deltas are ever taken from these
+        self.start_time = time.monotonic()
         self.stats = BotStats()
-        self._last_cache_update = datetime.now()
+        self._last_cache_update = time.monotonic()
+        # Named `session` because discord.py already owns `self.http`
+        self.session: Optional[aiohttp.ClientSession] = None
+        self._help_embed_base: Optional[discord.Embed] = None
+        self._invite_url: Optional[str] = None
         
     async def setup_hook(self) -> None:
         """Initialize bot resources"""
-        self.problems = await ProblemCacheManager.load_problems()
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=Config.REQUEST_TIMEOUT)
+        )
+        self._help_embed_base = build_help_embed()
+        self._set_problems(await ProblemCacheManager.load_problems(self.session))
         self.update_cache_loop.start()
         
     async def close(self) -> None:
         """Cleanup on bot shutdown"""
         self.update_cache_loop.cancel()
+        if self.session is not None:
+            await self.session.close()
         await super().close()
         
+    def _set_problems(self, problems: Dict[str, List[LeetCodeProblem]]) -> None:
+        """Install a fresh problem set, freezing each category into a tuple"""
+        self.problems = {k: tuple(v) for k, v in problems.items()}
+        self._problem_counts = {k: len(v) for k, v in self.problems.items()}
+        # Interview picks are shared with the difficulty buckets; keep one copy
+        seen: set = set()
+        self._all_problems = []
+        for bucket in self.problems.values():
+            for p in bucket:
+                if id(p) not in seen:
+                    seen.add(id(p))
+                    self._all_problems.append(p)
+        
+        # Inverted index: casefolded title/topic word -> indices into _all_problems
+        index: Dict[str, set] = defaultdict(set)
+        for i, problem in enumerate(self._all_problems):
+            for token in _TOKEN_RE.findall(problem.title_cf):
+                index[token].add(i)
+            for topic in problem.topics_cf:
+                for token in _TOKEN_RE.findall(topic):
+                    index[token].add(i)
+        self._search_index = dict(index)
+        
+        # Sorted (casefolded title, index) pairs for prefix lookups
+        self._title_keys = sorted((p.title_cf, i) for i, p in enumerate(self._all_problems))
+        
+        # Title and topics joined per problem so a phrase check is one 'in' test
+        self._search_text = ["\0".join((p.title_cf, *p.topics_cf)) for p in self._all_problems]
+        
+    def _lookup_index(self, query_cf: str, limit: int) -> List[LeetCodeProblem]:
+        """
+        Return problems sharing words with the query, best matches first
+        Full-phrase matches come first, then problems containing more of the
+        query words, each in catalog order. Candidates are taken from the
+        all-words intersection and only widened to partial-word matches when
+        that leaves room. A query word missing from the index, usually a
+        partially typed one, makes the phrase lookup scan the whole catalog.
+        """
+        postings = [self._search_index.get(t) for t in set(_TOKEN_RE.findall(query_cf))]
+        present = [p for p in postings if p]
+        if not present:
+            return []
+        
+        problems = self._all_problems
+        search_text = self._search_text
+        phrase_hits: List[int] = []
+        other_hits: List[int] = []
+        
+        # A partial word has no postings, so phrase matches may share no
+        # indexed word with the query; find them with a catalog-order scan
+        missing_word = len(present) < len(postings)
+        if missing_word:
+            phrase_hits = list(islice(
+                (i for i, text in enumerate(search_text) if query_cf in text), limit
+            ))
+            if len(phrase_hits) == limit:
+                return [problems[i] for i in phrase_hits]
+            full: set = set()
+        elif len(present) == 1:
+            full = present[0]
+        else:
+            full = set.intersection(*present)
+        
+        # Walk the all-words intersection in catalog order, stopping as soon
+        # as enough phrase matches are found
+        for i in sorted(full):
+            if query_cf in search_text[i]:
+                phrase_hits.append(i)
+                if len(phrase_hits) == limit:
+                    return [problems[i] for i in phrase_hits]
+            elif len(other_hits) < limit:
+                other_hits.append(i)
+        
+        # Widen to problems matching only some of the query words, most
+        # matched words first, phrase-checking any not already scanned
+        partial_hits: List[int] = []
+        if len(present) > 1 or not full:
+            found = set(phrase_hits)
+            matched_words: Dict[int, int] = defaultdict(int)
+            for posting in present:
+                for i in posting:
+                    if i not in full and i not in found:
+                        matched_words[i] += 1
+            by_count: Dict[int, List[int]] = defaultdict(list)
+            for i, count in matched_words.items():
+                by_count[count].append(i)
+            for count in sorted(by_count, reverse=True):
+                for i in sorted(by_count[count]):
+                    if not missing_word and query_cf in search_text[i]:
+                        phrase_hits.append(i)
+                        if len(phrase_hits) == limit:
+                            return [problems[i] for i in phrase_hits]
+                    elif len(partial_hits) < limit:
+                        partial_hits.append(i)
+        
+        results = (phrase_hits + other_hits + partial_hits)[:limit]
+        return [problems[i] for i in results]
+        
+    def _find_title_prefix(self, prefix: str) -> Optional[LeetCodeProblem]:
+        """Return the shortest title starting with prefix, ties broken by catalog order"""
+        keys = self._title_keys
+        best: Optional[Tuple[int, int]] = None
+        for j in range(bisect.bisect_left(keys, (prefix,)), len(keys)):
+            title, i = keys[j]
+            if not title.startswith(prefix):
+                break
+            if best is None or (len(title), i) < best:
+                best = (len(title), i)
+        return self._all_problems[best[1]] if best else None
+        
     @tasks.loop(hours=6)
     async def update_cache_loop(self):
         """Periodically update problem cache"""
         try:
-            scraped = await ProblemScraper.scrape_leetcode()
+            scraped = await ProblemScraper.scrape_leetcode(self.session)
             if scraped:
-                self.problems = scraped
+                self._set_problems(scraped)
                 await ProblemCacheManager._update_cache(scraped)
-                self._last_cache_update = datetime.now()
+                self._last_cache_update = time.monotonic()
                 logger.info("Problem cache updated successfully")
         except Exception as e:
             logger.error(f"Cache update failed: {e}")
@@ -482,8 +890,6 @@ class LeetCodeBot(commands.Bot):
 bot = LeetCodeBot()
 
 # --- Message Utilities ---
-from datetime import datetime  # Add this at the top of your file
-
 async def send_embed(
     ctx,
     *,
@@ -511,12 +917,12 @@ async def send_embed(
             embed.timestamp = timestamp
 
         if fields:
-            for field in fields:
-                if isinstance(field, dict) and {"name", "value"}.issubset(field):
+            for spec in fields:
+                if isinstance(spec, dict) and {"name", "value"}.issubset(spec):
                     embed.add_field(
-                        name=str(field["name"]),
-                        value=str(field["value"]),
-                        inline=field.get("inline", False)
+                        name=str(spec["name"]),
+                        value=str(spec["value"]),
+                        inline=spec.get("inline", False)
                     )
 
         if footer:
@@ -540,6 +946,38 @@ async def send_embed(
         await ctx.send(f"❌ Failed to send embed: {str(e)}")
         return False
     
+class StreamingPreview:
+    """Shows a live-updating plain message while an AI answer streams in"""
+    
+    def __init__(self, ctx: commands.Context):
+        self.ctx = ctx
+        self.message: Optional[discord.Message] = None
+        self._frozen = False
+        
+    async def update(self, text: str) -> None:
+        """Send or edit the preview with the head of the answer"""
+        if self._frozen:
+            return
+        # The final answer is truncated to this head, so stop once it's full
+        limit = Config.MAX_AI_RESPONSE_LENGTH
+        if len(text) >= limit:
+            self._frozen = True
+        preview = text[:limit]
+        # Raw model output must never ping @everyone, roles or users
+        if self.message is None:
+            self.message = await self.ctx.send(preview, allowed_mentions=discord.AllowedMentions.none())
+        else:
+            await self.message.edit(content=preview, allowed_mentions=discord.AllowedMentions.none())
+            
+    async def finish(self) -> None:
+        """Remove the preview once the formatted answer is ready to send"""
+        if self.message is not None:
+            try:
+                await self.message.delete()
+            except discord.HTTPException:
+                pass
+            self.message = None
+
 async def send_paginated(
     ctx,
     content: str,
@@ -600,72 +1038,67 @@ async def send_paginated(
             await message.add_reaction(emoji)
             
 # --- Bot Commands ---
-@bot.command(name="help")
-@commands.cooldown(1, Config.COMMAND_COOLDOWN, commands.BucketType.user)
-async def help_command(ctx: commands.Context):
-    """Show help message with all commands"""
-    bot.stats.commands_processed += 1
-
-    # Grouped table-like help content using code block formatting
-    fields = [
-        {
-            "name": "📚 LeetCode Problems",
-            "value": (
-                "```"
-                "Command               | Description\n"
-                "----------------------|------------------------------\n"
-                "!leetcode [easy]      | Random problem (or specific difficulty)\n"
-                "!lc [medium]          | Alias for !leetcode\n"
-                "!search <query>       | Search for problems by title/topic\n"
-                "!daily                | Today's daily challenge"
-                "```"
-            ),
-            "inline": False
-        },
-        {
-            "name": "🤖 AI Assistance",
-            "value": (
-                "```"
-                "Command               | Description\n"
-                "----------------------|------------------------------\n"
-                "!ask <question>       | Get coding help (code+explanation)\n"
-                "!hint <problem>       | Get a solution hint\n"
-                "!explain <concept>    | Detailed concept explanation\n"
-                "```"
-            ),
-            "inline": False
-        },
-        {
-            "name": "📊 Stats & Tracking",
-            "value": (
-                "```"
-                "Command               | Description\n"
-                "----------------------|------------------------------\n"
-                "!stats                | Show your solving statistics\n"
-                "!cache               | Show bot availability\n"
+# Grouped table-like help content using code block formatting
+_HELP_FIELDS = [
+    {
+        "name": "📚 LeetCode Problems",
+        "value": (
+            "```"
+            "Command               | Description\n"
+            "----------------------|------------------------------\n"
+            "!leetcode [easy]      | Random problem (or specific difficulty)\n"
+            "!lc [medium]          | Alias for !leetcode\n"
+            "!search <query>       | Search for problems by title/topic\n"
+            "!daily                | Today's daily challenge"
+            "```"
+        ),
+        "inline": False
+    },
+    {
+        "name": "🤖 AI Assistance",
+        "value": (
+            "```"
+            "Command               | Description\n"
+            "----------------------|------------------------------\n"
+            "!ask <question>       | Get coding help (code+explanation)\n"
+            "!hint <problem>       | Get a solution hint\n"
+            "!explain <concept>    | Detailed concept explanation\n"
+            "```"
+        ),
+        "inline": False
+    },
+    {
+        "name": "📊 Stats & Tracking",
+        "value": (
+            "```"
+            "Command               | Description\n"
+            "----------------------|------------------------------\n"
+            "!stats                | Show your solving statistics\n"
+            "!cache               | Show bot availability\n"
 
-                
-                "```"
-            ),
-            "inline": False
-        },
-        {
-            "name": "⚙️ Utility",
-            "value": (
-                "```"
-                "Command               | Description\n"
-                "----------------------|------------------------------\n"
-                "!ping                 | Check bot latency\n"
-                "!invite               | Get bot invite link\n"
-                "!help                 | Show this message"
-                "```"
-            ),
-            "inline": False
-        }
-    ]
+            
+            "```"
+        ),
+        "inline": False
+    },
+    {
+        "name": "⚙️ Utility",
+        "value": (
+            "```"
+            "Command               | Description\n"
+            "----------------------|------------------------------\n"
+            "!ping                 | Check bot latency\n"
+            "!invite               | Get bot invite link\n"
+            "!help                 | Show this message"
+            "```"
+        ),
+        "inline": False
+    }
+]
 
-    await send_embed(
-        ctx,
+def build_help_embed() -> discord.Embed:
+    """Build the static part of the help embed; the footer is set per request"""
+    embed = discord.Embed(
         title="🌟 Programming AI Assistant - Command Help 🌟",
         description=(
             "**The most advanced LeetCode assistant on Discord!**\n"
@@ -674,85 +1107,106 @@ async def help_command(ctx: commands.Context):
             "• Personalized learning tracking\n\n"
             f"Use `!help <command>` for detailed info about a specific command."
         ),
-        color=0xF89F1B,
-        fields=fields,
-        footer={
-            "text": f"Requested by {ctx.author.display_name} | {len(bot.commands)} commands available",
-            "icon_url": str(ctx.author.avatar.url) if ctx.author.avatar else None
-        }
+        color=0xF89F1B
+    )
+    for spec in _HELP_FIELDS:
+        embed.add_field(name=spec["name"], value=spec["value"], inline=spec["inline"])
+    return embed
+
+@bot.command(name="help")
+@commands.cooldown(1, Config.COMMAND_COOLDOWN, commands.BucketType.user)
+async def help_command(ctx: commands.Context):
+    """Show help message with all commands"""
+    author_name = ctx.author.display_name
+    author_icon = str(ctx.author.avatar.url) if ctx.author.avatar else None
+    bot.stats.commands_processed += 1
+
+    embed = bot._help_embed_base.copy()
+    embed.set_footer(
+        text=f"Requested by {author_name} | {len(bot.commands)} commands available",
+        icon_url=author_icon
     )
-leetcode_lock = asyncio.Lock()
+    await ctx.send(embed=embed)
 
 #Leet commands
 @bot.command(name="leetcode", aliases=["lc", "leet", "problem"])
 @commands.cooldown(2, Config.COMMAND_COOLDOWN, commands.BucketType.user)
 async def leetcode_command(ctx: commands.Context, difficulty: str = "random"):
-    """Fetch a LeetCode problem by difficulty (only one at a time globally)."""
-    async with leetcode_lock:
-        try:
-            bot.stats.commands_processed += 1
-
-            difficulty = difficulty.lower()
-            valid_difficulties = ['easy', 'medium', 'hard', 'interview', 'random']
-            if difficulty not in valid_difficulties:
-                await send_embed(
-                    ctx,
-                    title="❌ Invalid Difficulty",
-                    description=f"Please choose from: {', '.join(f'`{d}`' for d in valid_difficulties)}",
-                    color=discord.Color.red()
-                )
-                return
-
-            if difficulty == "random":
-                difficulty = random.choice(['easy', 'medium', 'hard', 'interview'])
-
-            problems = bot.problems.get(difficulty, [])
-            if not problems:
-                await send_embed(
-                    ctx,
-                    title="⚠️ No Problems Available",
-                    description=f"No `{difficulty}` problems in the database. Try again later.",
-                    color=discord.Color.orange()
-                )
-                return
-
-            problem = random.choice(problems)
-            bot.stats.problems_served += 1
-
-            display_difficulty = "Interview" if difficulty == "interview" else problem.difficulty.capitalize()
-
-            fields = [
-                {"name": "Difficulty", "value": display_difficulty, "inline": True},
-                {"name": "Acceptance Rate", "value": str(getattr(problem, 'acceptance_rate', 'N/A')), "inline": True},
-                {"name": "Frequency", "value": str(getattr(problem, 'frequency', 'N/A')), "inline": True}
-            ]
+    """Fetch a LeetCode problem by difficulty."""
+    author_name = ctx.author.display_name
+    author_icon = str(ctx.author.avatar.url) if ctx.author.avatar else None
+    try:
+        bot.stats.commands_processed += 1
 
+        difficulty = difficulty.lower()
+        valid_difficulties = ['easy', 'medium', 'hard', 'interview', 'random']
+        if difficulty not in valid_difficulties:
             await send_embed(
                 ctx,
-                title=f"📝 {problem.title}",
-                description=(
-                    f"**Here's your {'random ' if difficulty == 'random' else ''}"
-                    f"{display_difficulty} problem to solve!**\n\n"
-                    f"🔗 [View on LeetCode]({problem.url})\n"
-                ),
-                color=0xF89F1B,
-                fields=fields,
-                url=problem.url,
-                footer={
-                    "text": f"Requested by {ctx.author.display_name}",
-                    "icon_url": str(ctx.author.avatar.url) if ctx.author.avatar else None
-                },
-                thumbnail="https://leetcode.com/static/images/LeetCode_logo_rvs.png",
-                image=getattr(problem, 'preview_image', None)
+                title="❌ Invalid Difficulty",
+                description=f"Please choose from: {', '.join(f'`{d}`' for d in valid_difficulties)}",
+                color=_COLOR_RED
             )
-        except Exception as e:
+            return
+
+        if difficulty == "random":
+            difficulty = bot._rng.choice(('easy', 'medium', 'hard', 'interview'))
+
+        pool = bot.problems.get(difficulty)
+        if not pool:
             await send_embed(
                 ctx,
-                title="❌ Error",
-                description="An error occurred while fetching the problem.",
-                color=discord.Color.red()
+                title="⚠️ No Problems Available",
+                description=f"No `{difficulty}` problems in the database. Try again later.",
+                color=_COLOR_ORANGE
             )
-            print(f"Error in leetcode command: {e}")
+            return
+
+        problem = bot._rng.choice(pool)
+        bot.stats.problems_served += 1
+
+        display_difficulty = "Interview" if difficulty == "interview" else problem.difficulty_title
+
+        fields = [
+            {"name": "Difficulty", "value": display_difficulty, "inline": True},
+            {"name": "Acceptance Rate", "value": problem.acceptance_rate, "inline": True},
+            {"name": "Frequency", "value": problem.frequency, "inline": True}
+        ]
+
+        await send_embed(
+            ctx,
+            title=f"📝 {problem.title}",
+            description=(
+                f"**Here's your {'random ' if difficulty == 'random' else ''}"
+                f"{display_difficulty} problem to solve!**\n\n"
+                f"🔗 [View on LeetCode]({problem.url})\n"
+            ),
+            color=0xF89F1B,
+            fields=fields,
+            url=problem.url,
+            footer={
+                "text": f"Requested by {author_name}",
+                "icon_url": author_icon
+            },
+            thumbnail="https://leetcode.com/static/images/LeetCode_logo_rvs.png",
+            image=problem.preview_image
+        )
+    except Exception:
+        await send_embed(
+            ctx,
+            title="❌ Error",
+            description="An error occurred while fetching the problem.",
+            color=_COLOR_RED
+        )
+        logger.exception("Error in leetcode command")
+
+def _matches_substring(problem: LeetCodeProblem, query_cf: str) -> bool:
+    """Check the query against the title, then topics, skipping strings too short to contain it"""
+    query_len = len(query_cf)
+    title_cf = problem.title_cf
+    if query_len <= len(title_cf) and query_cf in title_cf:
+        return True
+    return any(query_len <= len(topic) and query_cf in topic for topic in problem.topics_cf)
 
 @bot.command(name="search")
 @commands.cooldown(2, Config.COMMAND_COOLDOWN, commands.BucketType.user)
@@ -763,6 +1217,8 @@ async def search_command(ctx: commands.Context, *, query: str):
     !search binary tree
     !search dynamic programming
     """
+    author_name = ctx.author.display_name
+    author_icon = str(ctx.author.avatar.url) if ctx.author.avatar else None
     try:
         bot.stats.commands_processed += 1
         
@@ -773,40 +1229,27 @@ async def search_command(ctx: commands.Context, *, query: str):
                 ctx,
                 title="❌ Search Error",
                 description="Search query must be at least 3 characters long",
-                color=discord.Color.red()
+                color=_COLOR_RED
             )
             return
         
-        # Flatten all problems from all difficulty categories
-        all_problems = []
-        for difficulty in bot.problems.values():
-            all_problems.extend(difficulty)
-        
-        # Normalize query and search
-        query_lower = query.lower()
-        matches = []
+        # Normalize query and look up whole words in the index first
+        query_cf = query.casefold()
+        matches = bot._lookup_index(query_cf, limit=10)
         
-        for problem in all_problems:
-            # Check title match
-            title_match = query_lower in problem.title.lower()
-            
-            # Check topic matches
-            topic_matches = any(
-                query_lower in topic.lower() 
-                for topic in getattr(problem, 'topics', [])
-            )
-            
-            if title_match or topic_matches:
-                matches.append(problem)
-                if len(matches) >= 10:  # Limit to 10 results
-                    break
+        # Fall back to a substring scan for partial-word queries
+        if not matches:
+            matches = list(islice(
+                (p for p in bot._all_problems if _matches_substring(p, query_cf)),
+                10  # Limit to 10 results
+            ))
         
         if not matches:
             await send_embed(
                 ctx,
                 title="🔍 No Results Found",
                 description=f"No problems matched your search: '{query}'",
-                color=discord.Color.orange(),
+                color=_COLOR_ORANGE,
                 footer={"text": "Try different keywords"}
             )
             return
@@ -815,12 +1258,12 @@ async def search_command(ctx: commands.Context, *, query: str):
             # Single result - show detailed view
             problem = matches[0]
             fields = [
-                {"name": "Difficulty", "value": problem.difficulty.capitalize(), "inline": True},
-                {"name": "Acceptance", "value": getattr(problem, 'acceptance_rate', 'N/A'), "inline": True},
-                {"name": "Topics", "value": ", ".join(getattr(problem, 'topics', ['Various'])), "inline": False}
+                {"name": "Difficulty", "value": problem.difficulty_title, "inline": True},
+                {"name": "Acceptance", "value": problem.acceptance_rate, "inline": True},
+                {"name": "Topics", "value": ", ".join(problem.topics) or "Various", "inline": False}
             ]
             
-            if getattr(problem, 'is_premium', False):
+            if problem.is_premium:
                 fields.append({"name": "Premium", "value": "🔒 Premium Problem", "inline": True})
             
             await send_embed(
@@ -829,34 +1272,35 @@ async def search_command(ctx: commands.Context, *, query: str):
                 description=(
                     f"**Here's your search result:**\n\n"
                     f"🔗 [View on LeetCode]({problem.url})\n"
-                    f"📝 {getattr(problem, 'short_description', 'No description available')}"
+                    f"📝 {problem.short_description}"
                 ),
-                color=0x5865F2,
+                color=_COLOR_BRAND,
                 fields=fields,
                 url=problem.url,
                 thumbnail="https://leetcode.com/static/images/LeetCode_logo_rvs.png",
                 footer={
-                    "text": f"Requested by {ctx.author.display_name}",
-                    "icon_url": str(ctx.author.avatar.url) if ctx.author.avatar else None
+                    "text": f"Requested by {author_name}",
+                    "icon_url": author_icon
                 }
             )
         else:
             # Multiple results - show list
-            description = "\n".join(
+            lines = [
                 f"{idx+1}. **[{p.title}]({p.url})** "
-                f"({p.difficulty.capitalize()})"
-                f"{' 🔒' if getattr(p, 'is_premium', False) else ''}"
+                f"({p.difficulty_title})"
+                f"{' 🔒' if p.is_premium else ''}"
                 for idx, p in enumerate(matches)
-            )
+            ]
+            description = "\n".join(lines)
             
             await send_embed(
                 ctx,
                 title=f"🔍 Search Results for '{query}'",
                 description=description,
-                color=0x5865F2,
+                color=_COLOR_BRAND,
                 footer={
                     "text": f"Showing {len(matches)} matches • Use !search <number> to select",
-                    "icon_url": str(ctx.author.avatar.url) if ctx.author.avatar else None
+                    "icon_url": author_icon
                 }
             )
             
@@ -865,31 +1309,35 @@ async def search_command(ctx: commands.Context, *, query: str):
             ctx,
             title="❌ Search Failed",
             description=f"An error occurred while searching: {str(e)}",
-            color=discord.Color.red()
+            color=_COLOR_RED
         )
-        print(f"Search error: {e}")
+        logger.exception("Search error")
 
 @bot.command(name="ask")
 @commands.cooldown(3, Config.COMMAND_COOLDOWN, commands.BucketType.user)
 async def ask_command(ctx: commands.Context, *, question: str):
     """Ask the AI a coding question"""
-    bot.stats.commands_processed += 1
-    bot.stats.ai_queries += 1
-
     if len(question) > Config.MAX_QUESTION_LENGTH:
         await ctx.send(f"❌ Your question is too long. Please limit to {Config.MAX_QUESTION_LENGTH} characters.")
         return
 
+    author_name = ctx.author.display_name
+    author_icon = str(ctx.author.avatar.url) if ctx.author.avatar else None
+    bot.stats.commands_processed += 1
+    bot.stats.ai_queries += 1
+
     await ctx.typing()
 
-    response = await AIHelper.query_ai(question)
+    preview = StreamingPreview(ctx)
+    response = await AIHelper.query_ai(bot.session, question, on_progress=preview.update)
+    await preview.finish()
     if not response:
         await ctx.send("⚠️ Sorry, I couldn't process your question at the moment. Please try again later.")
         return
 
     # Format AI answer with headers
     header_text = (
-        f"🧠 **Programmer Agent's Answer** – _Tailored for {ctx.author.display_name}_\n\n"
+        f"🧠 **Programmer Agent's Answer** – _Tailored for {author_name}_\n\n"
         f"❓ **Question:** `{question}`\n\n"
     )
     footer_text = "\n━━━━━━━━━━━━━━━━━━━━\n💎 _Need more depth? Try `!explain` or `!optimize`_"
@@ -899,9 +1347,25 @@ async def ask_command(ctx: commands.Context, *, question: str):
     if not contains_code:
         response = f"### ✨ Answer:\n\n{response.strip()}"
 
+    content = f"{header_text}{response}{footer_text}"
+
+    # Short plain answers fit a single simple embed; skip the paginated layout
+    if not contains_code and len(content) < Config.SHORT_ANSWER_LENGTH:
+        await send_embed(
+            ctx,
+            title="🔮 Programming AI Assistant",
+            description=content,
+            color=0x8A2BE2,
+            footer={
+                "text": f"👤 Asked by {author_name}",
+                "icon_url": author_icon
+            }
+        )
+        return
+
     await send_paginated(
         ctx,
-        content=f"{header_text}{response}{footer_text}",
+        content=content,
         color=0x8A2BE2,  # Elegant purple-blue for AI answers
         contains_code=contains_code,
         prefix="",
@@ -911,8 +1375,8 @@ async def ask_command(ctx: commands.Context, *, question: str):
             "icon": "https://i.imgur.com/J5hZ5zP.png"
         },
         footer={
-            "text": f"👤 Asked by {ctx.author.display_name}",
-            "icon": str(ctx.author.avatar.url) if ctx.author.avatar else None
+            "text": f"👤 Asked by {author_name}",
+            "icon": author_icon
         },
         interactive={
             "reactions": ["💡", "🔧", "❓"] if not contains_code else ["📊", "🧪", "🛠️"],
@@ -930,35 +1394,32 @@ async def explain_command(ctx: commands.Context, *, concept: str):
     !explain dynamic programming
     """
     try:
-        bot.stats.commands_processed += 1
-        bot.stats.ai_queries += 1
-        
         concept = concept.strip()
         if len(concept) > Config.MAX_QUESTION_LENGTH:
             await send_embed(
                 ctx,
                 title="❌ Concept Too Long",
                 description=f"Maximum length is {Config.MAX_QUESTION_LENGTH} characters",
-                color=discord.Color.red()
+                color=_COLOR_RED
             )
             return
+        
+        bot.stats.commands_processed += 1
+        bot.stats.ai_queries += 1
             
-        prompt = (
-            f"Explain the programming concept '{concept}' in detail with:\n"
-            "1. Clear definition\n2. Common use cases\n3. Example code snippets\n"
-            "4. Time/space complexity\n5. Related concepts\n\n"
-            "Format with Markdown headings and code blocks."
-        )
+        prompt = _EXPLAIN_PROMPT.format(concept=concept)
         
+        preview = StreamingPreview(ctx)
         async with ctx.typing():
-            response = await AIHelper.query_ai(prompt)
+            response = await AIHelper.query_ai(bot.session, prompt, on_progress=preview.update)
+        await preview.finish()
             
         if not response:
             await send_embed(
                 ctx,
                 title="⚠️ Service Unavailable",
                 description="AI service is currently unavailable",
-                color=discord.Color.orange()
+                color=_COLOR_ORANGE
             )
             return
             
@@ -972,9 +1433,9 @@ async def explain_command(ctx: commands.Context, *, concept: str):
             ctx,
             title="❌ Explanation Failed",
             description=f"Error: {str(e)}",
-            color=discord.Color.red()
+            color=_COLOR_RED
         )
-        print(f"Explain error: {e}")
+        logger.exception("Explain error")
 
 
 @bot.command(name="hint")
@@ -986,49 +1447,47 @@ async def hint_command(ctx: commands.Context, *, problem_name: str):
     !hint two sum
     !hint reverse linked list
     """
+    author_name = ctx.author.display_name
+    author_icon = str(ctx.author.avatar.url) if ctx.author.avatar else None
     try:
-        bot.stats.commands_processed += 1
-        bot.stats.ai_queries += 1
-        
         problem_name = problem_name.strip()
         if len(problem_name) < 3:
             await send_embed(
                 ctx,
                 title="❌ Invalid Problem Name",
                 description="Please provide at least 3 characters",
-                color=discord.Color.red()
+                color=_COLOR_RED
             )
             return
-
-        # Search across all difficulties
-        all_problems = []
-        for difficulty in bot.problems.values():
-            all_problems.extend(difficulty)
         
-        # Find closest matching problem
-        matches = [
-            p for p in all_problems
-            if problem_name.lower() in p.title.lower()
-        ]
+        bot.stats.commands_processed += 1
+        bot.stats.ai_queries += 1
+
+        # Prefer a title-prefix match, then fall back to the first substring match
+        name_cf = problem_name.casefold()
+        problem = bot._find_title_prefix(name_cf)
+        if problem is None:
+            problem = next(
+                (p for p in bot._all_problems if name_cf in p.title_cf),
+                None
+            )
         
-        if not matches:
+        if problem is None:
             await send_embed(
                 ctx,
                 title="🔍 Problem Not Found",
                 description=f"No problems matching '{problem_name}'\nTry !search first",
-                color=discord.Color.orange()
+                color=_COLOR_ORANGE
             )
             return
-            
-        problem = matches[0]
         
-        if getattr(problem, 'solution_hint', None):
+        if problem.solution_hint:
             hint = problem.solution_hint
         else:
             async with ctx.typing():
                 hint = await AIHelper.query_ai(
-                    f"Provide a helpful but not complete hint for LeetCode problem '{problem.title}'. "
-                    "Focus on the key insight needed to solve it."
+                    bot.session,
+                    _HINT_PROMPT.format(title=problem.title)
                 )
                 if not hint:
                     hint = "No hint available for this problem."
@@ -1040,8 +1499,8 @@ async def hint_command(ctx: commands.Context, *, problem_name: str):
             color=0xF89F1B,
             url=problem.url,
             footer={
-                "text": f"Requested by {ctx.author.display_name}",
-                "icon_url": str(ctx.author.avatar.url) if ctx.author.avatar else None
+                "text": f"Requested by {author_name}",
+                "icon_url": author_icon
             },
         )
 
@@ -1050,26 +1509,29 @@ async def hint_command(ctx: commands.Context, *, problem_name: str):
             ctx,
             title="❌ Hint Failed",
             description=f"Error: {str(e)}",
-            color=discord.Color.red()
+            color=_COLOR_RED
         )
-        print(f"Hint error: {e}")
+        logger.exception("Hint error")
 
 
 @bot.command(name="stats")
 async def stats_command(ctx: commands.Context):
     """Show bot usage statistics"""
+    author_name = ctx.author.display_name
+    author_icon = str(ctx.author.avatar.url) if ctx.author.avatar else None
     try:
         bot.stats.commands_processed += 1
         
         # Calculate uptime
-        delta = datetime.now() - bot.start_time
-        days = delta.days
-        hours, remainder = divmod(delta.seconds, 3600)
-        minutes, seconds = divmod(remainder, 60)
+        now = time.monotonic()
+        seconds = int(now - bot.start_time)
+        days, seconds = divmod(seconds, 86400)
+        hours, seconds = divmod(seconds, 3600)
+        minutes, seconds = divmod(seconds, 60)
         uptime_str = f"{days}d {hours}h {minutes}m {seconds}s"
         
-        # Problem counts
-        problem_counts = {k: len(v) for k, v in bot.problems.items()}
+        # Problem counts, snapshotted whenever the problem set is refreshed
+        problem_counts = bot._problem_counts
         
         fields = [
             {"name": "🕒 Uptime", "value": uptime_str, "inline": True},
@@ -1084,7 +1546,7 @@ async def stats_command(ctx: commands.Context):
                  f"• Interview: {problem_counts.get('interview', 0):,}"
              ), "inline": True},
             {"name": "🔄 Last Update", 
-             "value": bot._last_cache_update.strftime("%Y-%m-%d %H:%M"), 
+             "value": (datetime.now() - timedelta(seconds=now - bot._last_cache_update)).strftime("%Y-%m-%d %H:%M"), 
              "inline": True}
         ]
         
@@ -1093,11 +1555,11 @@ async def stats_command(ctx: commands.Context):
             title="📈 Bot Statistics",
             description="Current usage metrics and performance:",
             fields=fields,
-            color=0x5865F2,
+            color=_COLOR_BRAND,
             thumbnail="https://cdn-icons-png.flaticon.com/512/3132/3132693.png",
             footer={
-                "text": f"Requested by {ctx.author.display_name}",
-                "icon_url": str(ctx.author.avatar.url) if ctx.author.avatar else None
+                "text": f"Requested by {author_name}",
+                "icon_url": author_icon
             }
         )
 
@@ -1106,18 +1568,22 @@ async def stats_command(ctx: commands.Context):
             ctx,
             title="❌ Stats Failed",
             description=f"Error: {str(e)}",
-            color=discord.Color.red()
+            color=_COLOR_RED
         )
-        print(f"Stats error: {e}")
+        logger.exception("Stats error")
 
 
 @bot.command(name="cache")
 async def cache_command(ctx: commands.Context):
     """Show problem cache status"""
+    author_name = ctx.author.display_name
+    author_icon = str(ctx.author.avatar.url) if ctx.author.avatar else None
     try:
-        cache_exists = os.path.exists(Config.CACHE_FILE)
-        cache_size = os.path.getsize(Config.CACHE_FILE) if cache_exists else 0
-        cache_time = datetime.fromtimestamp(os.path.getmtime(Config.CACHE_FILE)) if cache_exists else None
+        try:
+            st = os.stat(Config.CACHE_FILE)
+            cache_exists, cache_size, cache_time = True, st.st_size, datetime.fromtimestamp(st.st_mtime)
+        except FileNotFoundError:
+            cache_exists, cache_size, cache_time = False, 0, None
         
         fields = [
             {"name": "Status", "value": "✅ Active" if cache_exists else "❌ Inactive", "inline": True},
@@ -1134,10 +1600,10 @@ async def cache_command(ctx: commands.Context):
             title="🗃️ Cache Information",
             description="Problem cache status and details:",
             fields=fields,
-            color=0x5865F2,
+            color=_COLOR_BRAND,
             footer={
-                "text": f"Requested by {ctx.author.display_name}",
-                "icon_url": str(ctx.author.avatar.url) if ctx.author.avatar else None
+                "text": f"Requested by {author_name}",
+                "icon_url": author_icon
             }
         )
 
@@ -1146,9 +1612,9 @@ async def cache_command(ctx: commands.Context):
             ctx,
             title="❌ Cache Info Failed",
             description=f"Error: {str(e)}",
-            color=discord.Color.red()
+            color=_COLOR_RED
         )
-        print(f"Cache error: {e}")
+        logger.exception("Cache error")
 
 
  # At the top of your file with other imports
@@ -1156,6 +1622,8 @@ async def cache_command(ctx: commands.Context):
 @bot.command(name="ping")
 async def ping_command(ctx: commands.Context):
     """Check bot latency and connection status"""
+    author_name = ctx.author.display_name
+    author_icon = str(ctx.author.avatar.url) if ctx.author.avatar else None
     try:
         latency = round(bot.latency * 1000, 2)
         status = "🟢 Excellent" if latency < 100 else "🟡 Good" if latency < 300 else "🔴 Slow"
@@ -1164,98 +1632,108 @@ async def ping_command(ctx: commands.Context):
             ctx,
             title="🏓 Pong!",
             description=f"**Latency:** {latency}ms\n**Status:** {status}",
-            color=discord.Color.green(),
+            color=_COLOR_GREEN,
             footer={
-                "text": f"Requested by {ctx.author.display_name}",
-                "icon_url": str(ctx.author.avatar.url) if ctx.author.avatar else None
+                "text": f"Requested by {author_name}",
+                "icon_url": author_icon
             }
         )
 
-    except Exception as e:
+    except Exception:
         await send_embed(
             ctx,
             title="❌ Ping Failed",
             description="Could not measure bot latency",
-            color=discord.Color.red()
+            color=_COLOR_RED
         )
-        print(f"Ping error: {e}")
+        logger.exception("Ping error")
 
 
 
+# Recommended permissions requested by the invite link
+_INVITE_PERMISSIONS = discord.Permissions(
+    read_messages=True,
+    send_messages=True,
+    embed_links=True,
+    attach_files=True,
+    read_message_history=True,
+    add_reactions=True
+)
+_INVITE_PERMISSIONS_TEXT = (
+    "**Required Permissions:**\n"
+    "• Read Messages\n• Send Messages\n• Embed Links\n"
+    "• Attach Files\n• Read Message History\n• Add Reactions"
+)
+
 @bot.command(name="invite")
 async def invite_command(ctx: commands.Context):
     """Get the bot's invite link"""
+    author_icon = str(ctx.author.avatar.url) if ctx.author.avatar else None
     try:
-        # Generate invite link with recommended permissions
-        permissions = discord.Permissions(
-            read_messages=True,
-            send_messages=True,
-            embed_links=True,
-            attach_files=True,
-            read_message_history=True,
-            add_reactions=True
-        )
-        invite_url = discord.utils.oauth_url(bot.user.id, permissions=permissions)
+        # The link only depends on the bot user id, so build it once
+        if bot._invite_url is None:
+            bot._invite_url = discord.utils.oauth_url(bot.user.id, permissions=_INVITE_PERMISSIONS)
+        invite_url = bot._invite_url
         
         await send_embed(
             ctx,
             title="🔗 Invite Me To Your Server!",
-            description=f"[Click here to add me to your server]({invite_url})\n\n"
-                       "**Required Permissions:**\n"
-                       "• Read Messages\n• Send Messages\n• Embed Links\n"
-                       "• Attach Files\n• Read Message History\n• Add Reactions",
-            color=0x5865F2,  # Discord blurple
+            description=f"[Click here to add me to your server]({invite_url})\n\n{_INVITE_PERMISSIONS_TEXT}",
+            color=_COLOR_BRAND,
             thumbnail=bot.user.avatar.url if bot.user.avatar else None,
             footer={
                 "text": "Thank you for using me!",
-                "icon_url": str(ctx.author.avatar.url) if ctx.author.avatar else None
+                "icon_url": author_icon
             }
         )
         
-    except Exception as e:
+    except Exception:
         await send_embed(
             ctx,
             title="❌ Invite Failed",
             description="Couldn't generate invite link",
-            color=discord.Color.red()
+            color=_COLOR_RED
         )
-        print(f"Invite error: {e}")
-
-
+        logger.exception("Invite error")
+
+
+
+# Static fields shown by !about
+_ABOUT_FIELDS = [
+    {"name": "Version", "value": "1.0.5", "inline": True},
+    {"name": "Creator", "value": "Santunu Kaysar", "inline": True},
+    {"name": "GitHub", "value": "[SantunuMahin](https://github.com/santunumahin)", "inline": True},
+    {"name": "SCS Website", "value": "[ServerCodeSocity](https://servercodesocity.vercel.app)", "inline": True},
+    {
+        "name": "Description",
+        "value": (
+            "**LeetCode AI Assistant** helps you master coding interviews with:\n"
+            "• 💡 AI-Powered Explanations\n"
+            "• 📚 Vast Problem Database\n"
+            "• 🧠 Coding Hints & Concepts\n"
+            "• 🧪 Daily Challenges\n"
+            "• 📈 Performance Analytics\n"
+            "• 🔍 Interview Prep Toolkit"
+        ),
+        "inline": False
+    }
+]
 
 @bot.command(name="about")
 async def about_command(ctx: commands.Context):
     """Show information about this bot"""
+    author_name = ctx.author.display_name
+    author_icon = str(ctx.author.avatar.url) if ctx.author.avatar else None
     try:
-        fields = [
-            {"name": "Version", "value": "1.0.5", "inline": True},
-            {"name": "Creator", "value": "Santunu Kaysar", "inline": True},
-            {"name": "GitHub", "value": "[SantunuMahin](https://github.com/santunumahin)", "inline": True},
-            {"name": "SCS Website", "value": "[ServerCodeSocity](https://servercodesocity.vercel.app)", "inline": True},
-            {
-                "name": "Description",
-                "value": (
-                    "**LeetCode AI Assistant** helps you master coding interviews with:\n"
-                    "• 💡 AI-Powered Explanations\n"
-                    "• 📚 Vast Problem Database\n"
-                    "• 🧠 Coding Hints & Concepts\n"
-                    "• 🧪 Daily Challenges\n"
-                    "• 📈 Performance Analytics\n"
-                    "• 🔍 Interview Prep Toolkit"
-                ),
-                "inline": False
-            }
-        ]
-        
         await send_embed(
             ctx,
             title="🤖 Programming AI Assistant",
             description="Your intelligent companion for coding interviews and algorithm mastery.",
-            fields=fields,
+            fields=_ABOUT_FIELDS,
             color=0xF89F1B,
             footer={
-                "text": f"Requested by {ctx.author.display_name}",
-                "icon_url": str(ctx.author.avatar.url) if ctx.author.avatar else None
+                "text": f"Requested by {author_name}",
+                "icon_url": author_icon
             }
         )
 
@@ -1264,23 +1742,35 @@ async def about_command(ctx: commands.Context):
             ctx,
             title="❌ About Failed",
             description=f"An unexpected error occurred.\n```{str(e)}```",
-            color=discord.Color.red()
+            color=_COLOR_RED
         )
-        print(f"About error: {e}")
+        logger.exception("About error")
 
 # --- Error Handling ---
+_ERROR_HANDLERS = {
+    commands.CommandNotFound: lambda ctx, e: ctx.send(
+        "Command not found. Try `!help` for available commands."
+    ),
+    commands.MissingRequiredArgument: lambda ctx, e: ctx.send(
+        f"Missing argument: {e.param.name}. Usage: `!{ctx.command.name} {ctx.command.signature}`"
+    ),
+    commands.CommandOnCooldown: lambda ctx, e: ctx.send(
+        f"⏳ Command on cooldown. Try again in {e.retry_after:.1f} seconds."
+    ),
+}
 
 @bot.event
 async def on_command_error(ctx: commands.Context, error: commands.CommandError):
     """Handle command errors gracefully"""
     bot.stats.errors_encountered += 1
     
-    if isinstance(error, commands.CommandNotFound):
-        await ctx.send("Command not found. Try `!help` for available commands.")
-    elif isinstance(error, commands.MissingRequiredArgument):
-        await ctx.send(f"Missing argument: {error.param.name}. Usage: `!{ctx.command.name} {ctx.command.signature}`")
-    elif isinstance(error, commands.CommandOnCooldown):
-        await ctx.send(f"⏳ Command on cooldown. Try again in {error.retry_after:.1f} seconds.")
+    handler = _ERROR_HANDLERS.get(type(error))
+    if handler is None:
+        # Subclasses of the handled errors miss the exact-type lookup
+        handler = next((h for t, h in _ERROR_HANDLERS.items() if isinstance(error, t)), None)
+    
+    if handler is not None:
+        await handler(ctx, error)
     else:
         logger.error(f"Command error: {str(error)}")
         await ctx.send(f"⚠️ An error occurred: {str(error)}")